@@ -1,63 +1,62 @@
 # src/basescraper/cli.py (Corrected Structure)
 
 import typer
-from rich.console import Console
+from typer.core import TyperGroup
 import logging
 import sys
 import os
+from pathlib import Path
+from typing import List, Optional
 
-# Import the main scraper function and config
-try:
-    from basescraper import scraper, config
-except ImportError:
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-    if project_root not in sys.path:
-        sys.path.insert(0, project_root)
+# Import the main scraper function and config only when a command runs:
+# scraper pulls in selenium, lxml and httpx, which would make `--help` slow
+def _import_scraper():
     try:
-        from src.basescraper import scraper, config
-    except ImportError as e:
-        print(f"Fatal Error: Could not import scraper or config. Path: {sys.path}, Error: {e}")
-        sys.exit(1)
+        from basescraper import scraper, config
+    except ImportError:
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+        if project_root not in sys.path:
+            sys.path.insert(0, project_root)
+        try:
+            from src.basescraper import scraper, config
+        except ImportError as e:
+            print(f"Fatal Error: Could not import scraper or config. Path: {sys.path}, Error: {e}")
+            sys.exit(1)
+    return scraper, config
 
 # --- Typer App Initialization ---
-app = typer.Typer(help="A generic base scraper framework using Selenium.")
-console = Console()
+class _DefaultToRunGroup(TyperGroup):
+    """Makes `run` the default command, so `cli --url ...` (no command name) keeps working."""
+
+    def parse_args(self, ctx, args):
+        if not args or (args[0] not in self.commands and args[0] not in ctx.help_option_names and args[0] not in ('--install-completion', '--show-completion')):
+            args = ['run', *args]
+        return super().parse_args(ctx, args)
+
+app = typer.Typer(cls=_DefaultToRunGroup, help="A generic base scraper framework using Selenium. Runs the `run` command when no command is given.")
 
 # Configure root logger (basic config happens in config.py now)
 # We can still use logging here if needed
 log = logging.getLogger(__name__) # Get logger instance
 
-# --- CLI Command ---
-@app.command()
-def run(
-    target_url_cli: str = typer.Option(None, "--url", "-u", help="Target URL to scrape. Overrides config/env.", show_default=False),
-    output_file_cli: str = typer.Option(None, "--output", "-o", help="Output target (e.g., filename). Overrides config/env.", show_default=False),
-    headless_cli: bool = typer.Option(None, "--headless/--no-headless", help="Run browser headless (or not). Overrides config/env.", show_default=False),
-    wait_time_cli: int = typer.Option(None, "--wait", "-w", help="Wait time after page load (secs). Overrides config/env.", show_default=False)
-):
-    """
-    Runs the Tink.de landing page scraper.
-    Uses values from .env/config.py by default, but can be overridden by CLI options.
+# --- Shared Option Handling ---
+def _resolve_common_options(console, scraper, settings, output_file_cli, headless_cli, wait_time_cli, ready_selector_cli):
     """
-    console.print(f"[bold green]Starting base scraper framework via CLI...[/bold green]")
-    log.info("Resolving configuration settings...")
+    Resolves and validates the options both commands share (CLI > Env/Config Defaults), logging each value.
 
-    # --- Resolve configuration: Prioritize CLI > Env/Config Defaults ---
-    resolved_url = target_url_cli if target_url_cli is not None else config.BASE_URL
-    resolved_output = output_file_cli if output_file_cli is not None else config.OUTPUT_FILENAME
-    resolved_headless = headless_cli if headless_cli is not None else config.HEADLESS
-    resolved_wait_time = wait_time_cli if wait_time_cli is not None else config.DEFAULT_WAIT_TIME
+    Returns:
+        (output_file, headless, wait_time, ready_selector)
+    """
+    resolved_output = output_file_cli if output_file_cli is not None else settings.output_filename
+    resolved_headless = headless_cli if headless_cli is not None else settings.headless
+    resolved_wait_time = wait_time_cli if wait_time_cli is not None else settings.default_wait_time
+    resolved_ready_selector = ready_selector_cli if ready_selector_cli is not None else scraper.DEFAULT_READY_SELECTOR
 
-    log.info(f"  Target URL: {resolved_url}")
     log.info(f"  Output File Base: {resolved_output}")
     log.info(f"  Headless Mode: {resolved_headless}")
     log.info(f"  Wait Time: {resolved_wait_time}")
+    log.info(f"  Ready Selector: {resolved_ready_selector}")
 
-    # --- Validate essential parameters ---
-    if not resolved_url or not isinstance(resolved_url, str):
-        console.print(f"[bold red]Error:[/bold red] Target URL is missing or invalid ({resolved_url}). Provide via --url or set BASE_URL in .env/config.py.")
-        log.error(f"Resolved URL is invalid: {resolved_url}")
-        raise typer.Exit(code=1)
     if not resolved_output:
         console.print("[bold red]Error:[/bold red] Output filename is missing. Provide via --output or set OUTPUT_FILENAME in .env/config.py.")
         log.error(f"Resolved output filename is missing: {resolved_output}")
@@ -65,40 +64,149 @@ def run(
     if not isinstance(resolved_wait_time, int) or resolved_wait_time < 0:
          log.warning(f"Invalid wait time ({resolved_wait_time}), using default 5.")
          resolved_wait_time = 5
+    return resolved_output, resolved_headless, resolved_wait_time, resolved_ready_selector
+
+def _exit_with_status(console, success):
+    """Prints the final status and exits with code 0 on success, 1 otherwise."""
+    # This logic stays OUTSIDE the commands' try...except Exception blocks, so typer.Exit isn't caught there
+    if success:
+        console.print("[bold green]Framework finished successfully.[/bold green]")
+        raise typer.Exit(code=0) # Exit cleanly with success code 0
+    else:
+        # This handles both explicit failure (the scraper returned False)
+        # and unexpected exceptions caught by the command (where success remains False)
+        console.print("[bold yellow]Framework finished, but issues occurred (check logs or errors above).[/bold yellow]")
+        raise typer.Exit(code=1) # Exit with failure code 1
+
+# --- CLI Commands ---
+@app.command()
+def run(
+    target_urls_cli: Optional[List[str]] = typer.Option(None, "--url", "-u", help="Target URL to scrape (repeat for multiple URLs). Overrides config/env.", show_default=False),
+    output_file_cli: str = typer.Option(None, "--output", "-o", help="Output target (e.g., filename). Overrides config/env.", show_default=False),
+    headless_cli: bool = typer.Option(None, "--headless/--no-headless", help="Run browser headless (or not). Overrides config/env.", show_default=False),
+    wait_time_cli: int = typer.Option(None, "--wait", "-w", help="Max wait for the page's ready element (secs). Overrides config/env.", show_default=False),
+    ready_selector_cli: str = typer.Option(None, "--ready-selector", help="CSS selector that signals the page's data has rendered. Defaults to scraper.DEFAULT_READY_SELECTOR.", show_default=False),
+    scroll_cli: bool = typer.Option(False, "--scroll/--no-scroll", help="Keep scrolling (infinite-scroll pages) until no new ready-selector elements load."),
+    lean_cli: bool = typer.Option(False, "--lean/--no-lean", help="Don't load images, stylesheets and fonts in the browser (faster). Off by default: some sites need CSS to render or lazy-load."),
+    force_selenium_cli: bool = typer.Option(False, "--force-selenium", help="Always use the browser, skipping the plain-HTTP fast path for server-rendered pages.")
+):
+    """
+    Runs the Tink.de landing page scraper.
+    Uses values from .env/config.py by default, but can be overridden by CLI options.
+    """
+    from rich.console import Console
+    scraper, config = _import_scraper()
+    console = Console()
+    console.print("[bold green]Starting base scraper framework via CLI...[/bold green]")
+    log.info("Resolving configuration settings...")
+    settings = config.get_settings()
+
+    # --- Resolve configuration: Prioritize CLI > Env/Config Defaults ---
+    resolved_urls = target_urls_cli if target_urls_cli else [settings.base_url]
+    log.info(f"  Target URL(s): {', '.join(str(u) for u in resolved_urls)}")
+    resolved_output, resolved_headless, resolved_wait_time, resolved_ready_selector = _resolve_common_options(
+        console, scraper, settings, output_file_cli, headless_cli, wait_time_cli, ready_selector_cli)
+    log.info(f"  Scroll: {scroll_cli}")
+    log.info(f"  Force Selenium: {force_selenium_cli}")
+    log.info(f"  Lean Browsing: {lean_cli}")
+
+    # --- Validate essential parameters ---
+    for resolved_url in resolved_urls:
+        if not resolved_url or not isinstance(resolved_url, str):
+            console.print(f"[bold red]Error:[/bold red] Target URL is missing or invalid ({resolved_url}). Provide via --url or set BASE_URL in .env/config.py.")
+            log.error(f"Resolved URL is invalid: {resolved_url}")
+            raise typer.Exit(code=1)
 
     # --- Execute Scraper ---
     success = False # Default to False
     try:
-        # ONLY the potentially failing scraper call is inside this try block
-        success = scraper.run_scraper(
-            target_url=resolved_url,
-            output_file=resolved_output,
-            headless=resolved_headless,
-            wait_time=resolved_wait_time
-        )
+        # ONLY the potentially failing scraper calls are inside this try block
+        # Multiple URLs run one after another; the scraper's driver pool keeps the browser warm between them
+        success = True
+        base_name, extension = os.path.splitext(resolved_output)
+        for index, resolved_url in enumerate(resolved_urls, start=1):
+            # Number the output per URL so timestamped files from the same second don't collide
+            output_for_url = resolved_output if len(resolved_urls) == 1 else f"{base_name}_{index}{extension}"
+            url_success = scraper.run_scraper(
+                target_url=resolved_url,
+                output_file=output_for_url,
+                headless=resolved_headless,
+                wait_time=resolved_wait_time,
+                ready_selector=resolved_ready_selector,
+                scroll=scroll_cli,
+                force_selenium=force_selenium_cli,
+                lean=lean_cli
+            )
+            success = success and url_success
     except NotImplementedError as e:
         # Handle specific known error from base template design
         console.print(f"[bold red]Execution Failed:[/bold red] {e}")
         console.print("Ensure 'extract_data' and 'handle_data' are implemented in scraper.py.")
         log.error(f"NotImplementedError encountered: {e}", exc_info=True)
         raise typer.Exit(code=2) # Exit immediately for this specific setup error
-    except Exception as e:
+    except Exception:
         # Catch *unexpected* errors ONLY during scraping execution
-        console.print(f"[bold red]CLI Error: An unexpected exception occurred during scraping.[/bold red]")
+        console.print("[bold red]CLI Error: An unexpected exception occurred during scraping.[/bold red]")
         # Log the full traceback for debugging
         log.exception("Unhandled exception during scraper execution")
         # success remains False, flow continues to final exit logic below
 
     # --- Handle final exit status ---
-    # This logic is now OUTSIDE the main try...except Exception block
-    if success:
-        console.print(f"[bold green]Framework finished successfully.[/bold green]")
-        raise typer.Exit(code=0) # Exit cleanly with success code 0
-    else:
-        # This handles both explicit failure (run_scraper returned False)
-        # and unexpected exceptions caught above (where success remains False)
-        console.print(f"[bold yellow]Framework finished, but issues occurred (check logs or errors above).[/bold yellow]")
-        raise typer.Exit(code=1) # Exit with failure code 1
+    _exit_with_status(console, success)
+
+@app.command("run-many")
+def run_many(
+    urls_file: Path = typer.Argument(..., exists=True, dir_okay=False, readable=True, help="Text file with one URL per line (blank lines and '#' comments are ignored)."),
+    output_file_cli: str = typer.Option(None, "--output", "-o", help="Output target (e.g., filename). Overrides config/env.", show_default=False),
+    headless_cli: bool = typer.Option(None, "--headless/--no-headless", help="Run browser headless (or not) for pages that need Selenium. Overrides config/env.", show_default=False),
+    wait_time_cli: int = typer.Option(None, "--wait", "-w", help="Max wait for the ready element on pages that need Selenium (secs). Overrides config/env.", show_default=False),
+    ready_selector_cli: str = typer.Option(None, "--ready-selector", help="CSS selector that signals the page's data has rendered. Defaults to scraper.DEFAULT_READY_SELECTOR.", show_default=False),
+    lean_cli: bool = typer.Option(False, "--lean/--no-lean", help="Don't load images, stylesheets and fonts in the browser (faster). Off by default: some sites need CSS to render or lazy-load."),
+    force_selenium_cli: bool = typer.Option(False, "--force-selenium", help="Always use the browser, skipping concurrent plain-HTTP fetching.")
+):
+    """
+    Scrapes every URL in URLS_FILE concurrently into a single CSV file.
+    Uses values from .env/config.py by default, but can be overridden by CLI options.
+    """
+    from rich.console import Console
+    scraper, config = _import_scraper()
+    console = Console()
+    console.print("[bold green]Starting base scraper framework (batch) via CLI...[/bold green]")
+    log.info("Resolving configuration settings...")
+    settings = config.get_settings()
+
+    urls = [line.strip() for line in urls_file.read_text(encoding='utf-8').splitlines()]
+    urls = [url for url in urls if url and not url.startswith('#')]
+    log.info(f"  URLs File: {urls_file} ({len(urls)} URL(s))")
+    resolved_output, resolved_headless, resolved_wait_time, resolved_ready_selector = _resolve_common_options(
+        console, scraper, settings, output_file_cli, headless_cli, wait_time_cli, ready_selector_cli)
+    log.info(f"  Force Selenium: {force_selenium_cli}")
+    log.info(f"  Lean Browsing: {lean_cli}")
+
+    # --- Validate essential parameters ---
+    if not urls:
+        console.print(f"[bold red]Error:[/bold red] No URLs found in {urls_file}.")
+        log.error(f"URLs file contains no URLs: {urls_file}")
+        raise typer.Exit(code=1)
+
+    # --- Execute Scraper ---
+    success = False
+    try:
+        success = scraper.run_many(
+            target_urls=urls,
+            output_file=resolved_output,
+            headless=resolved_headless,
+            wait_time=resolved_wait_time,
+            ready_selector=resolved_ready_selector,
+            force_selenium=force_selenium_cli,
+            lean=lean_cli
+        )
+    except Exception:
+        console.print("[bold red]CLI Error: An unexpected exception occurred during batch scraping.[/bold red]")
+        log.exception("Unhandled exception during batch scraper execution")
+
+    # --- Handle final exit status ---
+    _exit_with_status(console, success)
 
 # --- Entry point for CLI ---
 if __name__ == "__main__":
@@ -3,6 +3,8 @@ import os
 from dotenv import load_dotenv
 import logging
 import sys
+from dataclasses import dataclass
+from functools import lru_cache
 
 # Configure logging first (optional, but good practice)
 # Get LOG_LEVEL from environment, default to INFO
@@ -17,37 +19,59 @@ log = logging.getLogger(__name__) # Get logger instance
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 dotenv_path = os.path.join(project_root, '.env')
 
-# Load environment variables from .env file
-load_success = load_dotenv(dotenv_path=dotenv_path, override=True)
-
-if load_success:
-    log.debug(f".env file found at {dotenv_path} and loaded.")
-else:
-    log.debug(f".env file not found at {dotenv_path}, using environment vars or defaults.")
-
-# --- Define configuration variables ---
-# Default to the example site URL, can be overridden by .env or --url
-BASE_URL = os.getenv("BASE_URL", "http://quotes.toscrape.com/scroll")
-# Default to a generic output filename base
-OUTPUT_FILENAME = os.getenv("OUTPUT_FILENAME", "scraped_data.csv")
-
-# HEADLESS setting (same logic as before)
-_headless_str = os.getenv("HEADLESS", "True")
-HEADLESS = _headless_str.lower() in ('true', '1', 't', 'yes')
-
-# DEFAULT_WAIT_TIME setting (same logic as before)
-_wait_time_str = os.getenv("DEFAULT_WAIT_TIME", "10") # Increased default for potentially slower example site
-try:
-    DEFAULT_WAIT_TIME = int(_wait_time_str)
-    if DEFAULT_WAIT_TIME < 0:
-        log.warning(f"DEFAULT_WAIT_TIME cannot be negative ('{_wait_time_str}'), using default 10.")
-        DEFAULT_WAIT_TIME = 10
-except (ValueError, TypeError):
-    log.warning(f"Invalid DEFAULT_WAIT_TIME env var ('{_wait_time_str}'), using default 10.")
-    DEFAULT_WAIT_TIME = 10
-
-# Log loaded config values at DEBUG level
-log.debug(f"Config loaded: BASE_URL={BASE_URL}")
-log.debug(f"Config loaded: OUTPUT_FILENAME={OUTPUT_FILENAME}")
-log.debug(f"Config loaded: HEADLESS={HEADLESS}")
-log.debug(f"Config loaded: DEFAULT_WAIT_TIME={DEFAULT_WAIT_TIME}")
\ No newline at end of file
+# Fallbacks used when neither .env nor the environment define a setting
+_DEFAULT_BASE_URL = "http://quotes.toscrape.com/scroll" # Example site, can be overridden by .env or --url
+_DEFAULT_OUTPUT_FILENAME = "scraped_data.csv" # Generic output filename base
+_DEFAULT_WAIT_TIME = 10 # Upper bound for waiting on the ready element, not a fixed sleep
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Resolved configuration values (see get_settings)."""
+    base_url: str
+    output_filename: str
+    headless: bool
+    default_wait_time: int
+
+
+def _parse_wait_time(wait_time_str: str) -> int:
+    try:
+        wait_time = int(wait_time_str)
+    except (ValueError, TypeError):
+        log.warning(f"Invalid DEFAULT_WAIT_TIME env var ('{wait_time_str}'), using default {_DEFAULT_WAIT_TIME}.")
+        return _DEFAULT_WAIT_TIME
+    if wait_time < 0:
+        log.warning(f"DEFAULT_WAIT_TIME cannot be negative ('{wait_time_str}'), using default {_DEFAULT_WAIT_TIME}.")
+        return _DEFAULT_WAIT_TIME
+    return wait_time
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Loads .env and parses the environment once per process; later calls return the cached Settings.
+    Call get_settings.cache_clear() to re-read the environment (e.g. in tests).
+    """
+    # Load environment variables from .env file
+    load_success = load_dotenv(dotenv_path=dotenv_path, override=True)
+    if load_success:
+        log.debug(f".env file found at {dotenv_path} and loaded.")
+    else:
+        log.debug(f".env file not found at {dotenv_path}, using environment vars or defaults.")
+
+    settings = Settings(
+        base_url=os.getenv("BASE_URL", _DEFAULT_BASE_URL),
+        output_filename=os.getenv("OUTPUT_FILENAME", _DEFAULT_OUTPUT_FILENAME),
+        headless=os.getenv("HEADLESS", "True").lower() in ('true', '1', 't', 'yes'),
+        default_wait_time=_parse_wait_time(os.getenv("DEFAULT_WAIT_TIME", str(_DEFAULT_WAIT_TIME))),
+    )
+    # Log loaded config values at DEBUG level
+    log.debug(f"Config loaded: {settings}")
+    return settings
+
+
+# --- Module-level aliases (kept for existing `config.BASE_URL`-style imports) ---
+BASE_URL = get_settings().base_url
+OUTPUT_FILENAME = get_settings().output_filename
+HEADLESS = get_settings().headless
+DEFAULT_WAIT_TIME = get_settings().default_wait_time
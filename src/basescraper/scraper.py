@@ -2,19 +2,31 @@
 # -*- coding: utf-8 -*-
 
 import logging
-import time
 import re # Keep re in case needed for future cleaning
 import csv
 from datetime import datetime
 import os
+import io
+import codecs
+import asyncio
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
 
-from bs4 import BeautifulSoup
+import httpx
+
+from lxml import etree, html
+from lxml.cssselect import CSSSelector
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.remote.client_config import ClientConfig
 
 try:
     from . import config
@@ -23,42 +35,279 @@ except ImportError:
 
 log = logging.getLogger(__name__) # Use module-level logger
 
+# --- Selectors for the EXAMPLE extract_data ---
+# REPLACE THESE (tag, class) pairs with the ones you find for your target website.
+# Plain tag + class lookups walk the tree directly, which is much cheaper than a general selector engine.
+_QUOTE_TAG, _QUOTE_CLASS = "div", "quote" # Container of one item (div.quote)
+_TEXT_TAG, _TEXT_CLASS = "span", "text" # div.quote span.text
+_AUTHOR_TAG, _AUTHOR_CLASS = "small", "author" # div.quote span small.author
+
+# Deletes fancy quotes in a single pass (str.translate) when cleaning the EXAMPLE quote text
+_QUOTE_STRIP = str.maketrans('', '', '“”')
+
+# --- Item type for the EXAMPLE data ---
+# REPLACE THIS with the fields YOUR extract_data produces.
+class Quote(NamedTuple):
+    """One scraped item. Being a tuple, it has no per-instance dict and csv.writer writes it as a row directly."""
+    quote: str
+    author: str
+
+# CSV columns for the EXAMPLE data (the item fields, in order)
+# IMPORTANT: If YOUR extract_data yields dictionaries instead, change this list to match their keys
+FIELDNAMES = list(Quote._fields)
+
+# --- Lean browsing (default): the browser skips everything extract_data doesn't need ---
+# Chrome content settings: 2 = block
+LEAN_CONTENT_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.stylesheets": 2,
+    "profile.managed_default_content_settings.fonts": 2,
+}
+LEAN_CHROME_ARGS = ["--blink-settings=imagesEnabled=false", "--disable-features=TranslateUI,BlinkGenPropertyTrees"]
+# URL patterns the browser never fetches (HTML/DOM is all extract_data needs)
+BLOCKED_RESOURCE_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.woff", "*.woff2", "*.ttf", "*.css", "*.mp4"]
+
+# urllib3 pool size for the Python -> chromedriver HTTP connection (urllib3 default is 1)
+WEBDRIVER_POOL_MAXSIZE = 20
+
 # --- Selenium Setup Function (Keep as is) ---
-def setup_driver(headless=True):
-    log.info(f"Setting up WebDriver (Headless: {headless})...")
+def setup_driver(headless=True, window_size="1920,1080", lean=False):
+    """
+    Starts Chrome. With lean=True images, stylesheets, fonts and media are not loaded (faster);
+    it is off by default because lazy-loading on many dynamic sites depends on layout/CSS.
+    """
+    log.info(f"Setting up WebDriver (Headless: {headless}, Lean: {lean})...")
     options = webdriver.ChromeOptions()
-    if headless: options.add_argument("--headless")
-    options.add_argument("--disable-gpu"); options.add_argument("--window-size=1920,1080")
+    if headless: options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu"); options.add_argument(f"--window-size={window_size}")
     options.add_argument("--no-sandbox"); options.add_argument("--disable-dev-shm-usage")
+    if lean:
+        options.add_experimental_option("prefs", LEAN_CONTENT_PREFS)
+        for argument in LEAN_CHROME_ARGS: options.add_argument(argument)
     try:
-        service = ChromeService(ChromeDriverManager().install())
+        # Selenium Manager (built into Selenium 4) resolves and caches chromedriver itself
+        service = ChromeService()
         driver = webdriver.Chrome(service=service, options=options)
+        _widen_connection_pool(driver)
+        if lean: _block_resources(driver)
         log.info("WebDriver setup successful.")
         return driver
     except Exception as e:
         log.error(f"Error setting up WebDriver: {e}", exc_info=True); raise
 
-# --- Navigation Function (Keep as is, but maybe improve wait) ---
-def navigate_to_url(driver, url, wait_time=config.DEFAULT_WAIT_TIME):
+def _widen_connection_pool(driver, maxsize=WEBDRIVER_POOL_MAXSIZE):
+    """
+    Rebuilds the driver's urllib3 pool with a larger maxsize so concurrent commands
+    (waits, polls, lookups) don't serialize on a single connection to chromedriver.
+    webdriver.Chrome doesn't accept a ClientConfig, so the executor's pool is swapped after startup.
+    """
+    executor = driver.command_executor
+    try:
+        client_config: ClientConfig = executor._client_config
+        client_config.init_args_for_pool_manager = {"init_args_for_pool_manager": {"maxsize": maxsize}}
+        old_conn, executor._conn = executor._conn, executor._get_connection_manager()
+        old_conn.clear()
+        log.debug(f"WebDriver connection pool maxsize set to {maxsize}.")
+    except AttributeError as e:
+        # Private Selenium internals changed; keep the default pool rather than failing setup
+        log.warning(f"Could not resize WebDriver connection pool, using Selenium default: {e}")
+
+def _block_resources(driver, patterns=BLOCKED_RESOURCE_PATTERNS):
+    """Tells Chrome (via CDP) to skip images, fonts, stylesheets and media for every navigation."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        log.debug(f"Blocking resource patterns: {patterns}")
+    except WebDriverException as e:
+        log.warning(f"Could not block resource loading via CDP, loading all resources: {e}")
+
+def _get_page_html(driver):
+    """Returns the current DOM as HTML via CDP, falling back to driver.page_source."""
+    try:
+        result = driver.execute_cdp_cmd("Runtime.evaluate", {"expression": "document.documentElement.outerHTML", "returnByValue": True})
+        return result["result"]["value"]
+    except (WebDriverException, KeyError) as e:
+        log.debug(f"CDP outerHTML fetch failed, using page_source: {e}")
+        return driver.page_source
+
+# --- WebDriver Pool (reuses warm browsers across scrapes) ---
+class DriverPool:
+    """
+    Keeps idle WebDriver instances around so repeated scrapes in the same process
+    skip the multi-second Chrome/chromedriver startup.
+    Drivers are keyed by (headless, window_size, lean) and are quit at interpreter exit.
+    """
+
+    def __init__(self):
+        self._idle = {} # (headless, window_size, lean) -> queue.Queue of idle drivers
+        self._drivers = [] # Every driver created by this pool, idle or in use
+        self._lock = threading.Lock()
+
+    def _idle_queue(self, key):
+        with self._lock:
+            return self._idle.setdefault(key, queue.Queue())
+
+    @contextmanager
+    def acquire(self, headless=True, window_size="1920,1080", lean=False):
+        """Yields an idle driver (or a new one) and returns it to the pool afterwards."""
+        idle = self._idle_queue((headless, window_size, lean))
+        try:
+            driver = idle.get_nowait()
+            log.info("Reusing pooled WebDriver.")
+        except queue.Empty:
+            driver = setup_driver(headless=headless, window_size=window_size, lean=lean)
+            with self._lock: self._drivers.append(driver)
+        try:
+            yield driver
+        finally:
+            if self._reset(driver): idle.put(driver)
+            else: self._discard(driver)
+
+    def _reset(self, driver):
+        """Clears per-site state so the next scrape starts clean. Returns False if the driver is unusable."""
+        try:
+            driver.delete_all_cookies()
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except WebDriverException:
+                log.debug("Could not clear web storage (page may not expose it).")
+            return True
+        except WebDriverException as e:
+            log.warning(f"Pooled WebDriver failed to reset, discarding it: {e}")
+            return False
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._drivers: self._drivers.remove(driver)
+        try: driver.quit()
+        except Exception as e: log.debug(f"Error quitting discarded WebDriver: {e}")
+
+    def close_all(self):
+        """Quits every driver created by this pool."""
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+            self._idle.clear()
+        for driver in drivers:
+            try: driver.quit()
+            except Exception as e: log.debug(f"Error quitting pooled WebDriver: {e}")
+        if drivers: log.info(f"WebDriver pool closed ({len(drivers)} driver(s)).")
+
+driver_pool = DriverPool()
+atexit.register(driver_pool.close_all)
+
+# --- Static HTTP Fast Path (skips the browser for server-rendered pages) ---
+# CSS selector whose presence means the data has rendered (EXAMPLE: quotes.toscrape.com)
+DEFAULT_READY_SELECTOR = "div.quote"
+# Seconds allowed per plain-HTTP request (separate from wait_time, which bounds the browser's ready-element wait)
+HTTP_TIMEOUT = 15
+# Bytes searched for a <meta charset> / XML declaration when the HTTP header gives no charset
+CHARSET_SNIFF_BYTES = 1024
+_DECLARED_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)|<\?xml[^>]+encoding\s*=\s*["']([\w.:-]+)""", re.IGNORECASE)
+_BOM_ENCODINGS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+_http_client = None
+
+def _sniff_html_encoding(content: bytes) -> str:
+    """
+    httpx `default_encoding` hook, only used when the Content-Type header has no charset.
+    Reads the BOM or the charset declared in the page itself (as the browser does), else UTF-8.
+    """
+    for bom, encoding in _BOM_ENCODINGS:
+        if content.startswith(bom):
+            return encoding
+    match = _DECLARED_CHARSET_RE.search(content[:CHARSET_SNIFF_BYTES])
+    if match:
+        try:
+            encoding = codecs.lookup((match.group(1) or match.group(2)).decode('ascii')).name
+        except LookupError:
+            return 'utf-8'
+        # Browsers decode pages labelled latin-1/ascii as windows-1252
+        return 'cp1252' if encoding in ('latin-1', 'ascii') else encoding
+    return 'utf-8'
+
+def _get_http_client():
+    """Returns the module-wide HTTP/2 client, so connections are reused across fetches."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(http2=True, follow_redirects=True, default_encoding=_sniff_html_encoding)
+        atexit.register(_http_client.close)
+    return _http_client
+
+@lru_cache(maxsize=32)
+def _compile_css(selector):
+    """Translates a CSS selector to XPath and compiles it once; later pages reuse the compiled object."""
+    return CSSSelector(selector, translator='html')
+
+def _has_ready_element(page_html, ready_selector):
+    # One parse of the whole page: selectors such as :last-of-type can only be decided on the finished tree.
+    # Parse bytes, not str: lxml rejects str input that starts with an XML encoding declaration (XHTML)
+    parser = html.HTMLParser(encoding='utf-8')
+    try:
+        return bool(_compile_css(ready_selector)(html.document_fromstring(page_html.encode('utf-8'), parser=parser)))
+    except etree.ParserError:
+        return False
+
+def fetch_static(url, ready_selector=DEFAULT_READY_SELECTOR, timeout=HTTP_TIMEOUT):
+    """
+    Fetches `url` with plain HTTP (no browser, no JavaScript).
+    Returns the HTML if `ready_selector` is already present in it, otherwise None
+    (the page needs JS rendering and should go through Selenium instead).
+    An empty `ready_selector` can't be checked in static HTML, so it always returns None.
+    """
+    if not ready_selector:
+        log.info("No ready selector to check static HTML against, using Selenium.")
+        return None
+    log.info(f"Trying static HTTP fetch for: {url}")
+    try:
+        response = _get_http_client().get(url, timeout=timeout)
+        response.raise_for_status()
+    except (httpx.HTTPError, httpx.InvalidURL) as e: # InvalidURL is not an HTTPError subclass
+        log.info(f"Static fetch failed ({e}), falling back to Selenium.")
+        return None
+    if not _has_ready_element(response.text, ready_selector):
+        log.info(f"'{ready_selector}' not found in static HTML (page likely needs JavaScript), falling back to Selenium.")
+        return None
+    log.info("Static HTML contains the data, skipping Selenium.")
+    return response.text
+
+# --- Navigation Function ---
+# Max seconds to wait for new items after each scroll before treating the page as fully loaded
+SCROLL_SETTLE_TIME = 2
+MAX_SCROLL_ROUNDS = 50
+
+def navigate_to_url(driver, url, wait_time=config.DEFAULT_WAIT_TIME, ready_selector=DEFAULT_READY_SELECTOR, scroll=False):
     log.info(f"Navigating to URL: {url}")
     try:
         driver.get(url)
-        # Example: Wait for the first quote element to be present for the example site
-        # WebDriverWait(driver, wait_time).until(
-        #     EC.presence_of_element_located((By.CSS_SELECTOR, "div.quote"))
-        # )
-        # Using a simple time.sleep might be okay for the template, or keep body wait
-        WebDriverWait(driver, wait_time).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        log.info(f"Page loaded. Waiting {wait_time} seconds for dynamic content (if any)...")
-        time.sleep(wait_time) # Allow time for initial JS load/scroll effects
-        log.info("Initial wait complete. Proceeding.")
-        return driver.page_source
+        # Wait only as long as it takes for the data element to appear (wait_time is the upper bound)
+        ready_locator = (By.CSS_SELECTOR, ready_selector) if ready_selector else (By.TAG_NAME, "body")
+        WebDriverWait(driver, wait_time).until(EC.presence_of_element_located(ready_locator))
+        log.info(f"Page ready ('{ready_locator[1]}' present).")
+        if scroll and ready_selector:
+            _scroll_until_stable(driver, ready_selector, wait_time)
+        return _get_page_html(driver)
     except Exception as e:
         log.error(f"Error navigating to {url} or waiting: {e}", exc_info=True); raise
 
+def _scroll_until_stable(driver, item_selector, wait_time):
+    """Scrolls an infinite-scroll page until the number of `item_selector` elements stops growing."""
+    count_items = lambda d: len(d.find_elements(By.CSS_SELECTOR, item_selector))
+    item_count = count_items(driver)
+    settle_time = min(wait_time, SCROLL_SETTLE_TIME)
+    for _ in range(MAX_SCROLL_ROUNDS):
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        try:
+            WebDriverWait(driver, settle_time).until(lambda d: count_items(d) > item_count)
+        except TimeoutException:
+            break # No new items appeared: the page is fully loaded
+        item_count = count_items(driver)
+        log.debug(f"Scrolled, {item_count} '{item_selector}' elements loaded so far.")
+    else:
+        log.warning(f"Stopped scrolling after {MAX_SCROLL_ROUNDS} rounds; page may have more items.")
+    log.info(f"Scrolling complete, {item_count} '{item_selector}' elements loaded.")
+
 
 # --- Data Extraction Function (EXAMPLE for quotes.toscrape.com/scroll) --- NEW ---
-def extract_data(page_source: str) -> list[dict]:
+def extract_data(page_source: str) -> Iterator[Quote]:
     """
     EXAMPLE IMPLEMENTATION: Parses HTML of quotes.toscrape.com/scroll.
     REPLACE THIS LOGIC with selectors and parsing for your specific target website.
@@ -66,108 +315,357 @@ def extract_data(page_source: str) -> list[dict]:
     Args:
         page_source (str): The HTML content of the page.
 
-    Returns:
-        A list of dictionaries, where each dictionary represents a scraped item.
-        Example: [{'quote': 'The world as we have created it is a process of our thinking...', 'author': 'Albert Einstein'}]
+    Yields:
+        One Quote per scraped item, as soon as it is parsed (nothing is accumulated).
+        Example: Quote(quote='The world as we have created it is a process of our thinking...', author='Albert Einstein')
     """
     log.info("Attempting to extract data using EXAMPLE (quotes.toscrape.com) logic...")
-    soup = BeautifulSoup(page_source, 'html.parser')
-    extracted_items = []
-    # Selector for the div containing each quote and author
-    quote_divs = soup.select("div.quote")
-
-    if not quote_divs:
-        log.warning("No quote divs found using selector 'div.quote'. Example site structure may have changed or page didn't load correctly.")
-        return []
-
-    log.info(f"Found {len(quote_divs)} quote elements in current view.")
-
-    for quote_div in quote_divs:
-        item = {}
+    extracted_count = 0
+    quote_count = 0
+    source = io.BytesIO(page_source.encode('utf-8'))
+    # Stream the parse and only stop at </div>: each quote is handled as soon as its subtree
+    # is complete and then freed, so finished quotes don't pile up in the tree
+    for _, quote_div in _iterparse_safely(source, _QUOTE_TAG):
+        # Selector for the div containing each quote and author
+        if not _has_class(quote_div, _QUOTE_CLASS):
+            continue
+        quote_count += 1
         # Selector for the quote text within the div
-        text_element = quote_div.select_one("span.text")
+        text_element = _find_first(quote_div, _TEXT_TAG, _TEXT_CLASS)
         # Selector for the author name within the div
-        author_element = quote_div.select_one("span small.author")
+        author_element = _find_first(quote_div, _AUTHOR_TAG, _AUTHOR_CLASS)
 
         # Clean text potentially removing fancy quotes if needed
-        item['quote'] = text_element.text.strip().replace('“', '').replace('”', '') if text_element else None
-        item['author'] = author_element.text.strip() if author_element else None
+        quote = _element_text(text_element).translate(_QUOTE_STRIP).strip() or None
+        author = _element_text(author_element) or None
 
         # Only add item if essential data was found
-        if item['quote'] and item['author']:
-            extracted_items.append(item)
-        else:
-             log.debug(f"Skipping quote div, missing text or author: {quote_div.text[:100].strip()}")
+        if quote and author:
+            extracted_count += 1
+            yield Quote(quote, author)
+        elif log.isEnabledFor(logging.DEBUG): # Skip the subtree text walk unless it will be logged
+            log.debug(f"Skipping quote div, missing text or author: {''.join(quote_div.itertext())[:100].strip()}")
+        _release_element(quote_div)
+
+    if not quote_count:
+        log.warning("No quote divs found using selector 'div.quote'. Example site structure may have changed or page didn't load correctly.")
+        return
+
+    log.info(f"Found {quote_count} quote elements in current view.")
+    log.info(f"Successfully extracted data for {extracted_count} quotes using EXAMPLE logic.")
+
+def _extract_all(page_source: str) -> list[Quote]:
+    """Runs extract_data to completion (for handing one page's items across threads)."""
+    return list(extract_data(page_source))
 
-    log.info(f"Successfully extracted data for {len(extracted_items)} quotes using EXAMPLE logic.")
-    return extracted_items
+def _has_class(element, css_class):
+    return css_class in (element.get('class') or '').split()
+
+def _find_first(element, tag, css_class):
+    """Returns the first descendant <tag> with `css_class`, stopping at the first match (None if none)."""
+    for descendant in element.iterdescendants(tag):
+        if _has_class(descendant, css_class):
+            return descendant
+    return None
+
+def _element_text(element):
+    """Returns the stripped text of `element` including its children (e.g. <b> inside the quote); '' for None."""
+    return ''.join(element.itertext()).strip() if element is not None else ''
+
+def _iterparse_safely(source, tag):
+    """Yields (event, element) for each closed `tag` element; an unparseable page just ends the iteration."""
+    try:
+        yield from etree.iterparse(source, events=('end',), tag=tag, html=True, encoding='utf-8')
+    except etree.XMLSyntaxError as e:
+        log.error(f"Could not parse page HTML: {e}")
+
+def _release_element(element):
+    """Frees a processed element's subtree and the already-processed siblings before it."""
+    element.clear(keep_tail=True)
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
 
 # --- Data Handling Function (EXAMPLE for quotes data) --- NEW ---
-def handle_data(data: list[dict], output_file: str):
+def handle_data(data: Iterable[Union[tuple, dict]], output_file: str):
     """
     EXAMPLE IMPLEMENTATION: Handles the extracted quote data, saving to timestamped CSV.
     Adapts fieldnames based on the example extraction ('quote', 'author').
-    MODIFY THIS if your extract_data function returns different dictionary keys.
+    MODIFY FIELDNAMES if your extract_data function returns different fields or dictionary keys.
+    Items are streamed through a CSVSink, so `data` can be the extract_data generator
+    itself and memory use does not grow with the number of items.
 
     Args:
-        data: A list of dictionaries from extract_data.
+        data: An iterable of items (NamedTuples such as Quote, or dictionaries) from extract_data.
         output_file: The base path/filename for the output CSV file.
     """
-    if not data:
-        log.warning("No data extracted, skipping CSV file writing.")
-        return
+    # Fieldnames specific to the quotes example (see FIELDNAMES at the top of this module)
+    sink = CSVSink(output_file, fieldnames=FIELDNAMES)
+    # --- Write data to CSV (Keep as is, uses fieldnames list) ---
+    # Only write errors are handled here: errors raised by a streaming extract_data
+    # must still reach run_scraper so the run is reported as failed
+    try:
+        with sink:
+            for item in data:
+                sink.write(item)
+    except (IOError, csv.Error) as e: log.error(f"Error writing data to {sink.final_filename or output_file}: {e}", exc_info=True)
 
-    # Fieldnames specific to the quotes example
-    # IMPORTANT: Change this list to match the keys in the dictionaries returned by YOUR extract_data
-    fieldnames = ['quote', 'author']
 
-    # --- Timestamped filename logic (Keep as is) ---
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    base_name, extension = os.path.splitext(output_file)
-    if not extension: extension = ".csv"
-    final_filename = f"{base_name}_{timestamp}{extension}"
-    log.info(f"Preparing to save data to: {final_filename}")
+# --- CSV writing helpers ---
+CSV_BUFFER_SIZE = 4 * 1024 * 1024 # Fewer, larger write() syscalls than the default 8 KiB
+CSV_CHUNK_ROWS = 10_000 # Rows held in memory before they are written out
+# Opt-in: write with pyarrow's C++ CSV writer (needs `pip install pyarrow`). Its output differs from
+# the stdlib csv module: every string value and the header are quoted, and lines end in '\n' instead of '\r\n'.
+USE_PYARROW_CSV = False
 
-    # --- Write data to CSV (Keep as is, uses fieldnames list) ---
+@lru_cache(maxsize=1)
+def _load_pyarrow_csv():
+    """Returns pyarrow.csv if the optional pyarrow package is installed, else None."""
     try:
-        output_dir = os.path.dirname(final_filename)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir); log.info(f"Created output directory: {output_dir}")
+        import pyarrow.csv
+        return pyarrow.csv
+    except ImportError:
+        log.warning("USE_PYARROW_CSV is set but pyarrow is not installed, using the stdlib csv writer.")
+        return None
 
-        with open(final_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            # Use extrasaction='ignore' to prevent errors if data dict has extra keys
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
-            # Check if fieldnames are actually in the first data item (optional robustness)
-            if data and not all(key in data[0] for key in fieldnames):
-                 log.warning(f"Mismatch between defined fieldnames {fieldnames} and keys in extracted data {list(data[0].keys())}. Writing may be incomplete.")
+class CSVSink:
+    """
+    Streams items into a timestamped CSV file in chunks of CSV_CHUNK_ROWS, so at most one
+    chunk is ever held in memory. The file is created when the first chunk is written
+    (nothing is created if no items arrive). Rows are written with the stdlib csv module,
+    or with pyarrow's C++ CSV writer if use_pyarrow is set and pyarrow is installed.
+    Items are tuples in fieldnames order (e.g. Quote), written as-is, or dictionaries,
+    whose values are picked out by key (the type of the first item decides).
+    Use as a context manager; close() writes the remaining rows.
+    """
 
-            writer.writeheader()
-            writer.writerows(data)
-        log.info(f"Data successfully saved to {final_filename}")
-    # More specific exception catching can be useful
-    except IOError as e: log.error(f"Error writing data to {final_filename}: {e}", exc_info=True)
-    except Exception as e: log.error(f"An unexpected error occurred during CSV writing: {e}", exc_info=True)
+    def __init__(self, output_file: str, fieldnames: list[str] = FIELDNAMES, use_pyarrow: Optional[bool] = None):
+        self.output_file = output_file
+        self.fieldnames = fieldnames
+        self.use_pyarrow = USE_PYARROW_CSV if use_pyarrow is None else use_pyarrow
+        self.final_filename = None
+        self.rows_written = 0
+        self._pending = []
+        self._file = None # Text file for the csv module backend
+        self._csv_writer = None
+        self._arrow_writer = None # pyarrow.csv.CSVWriter for the pyarrow backend
+        self._arrow_schema = None
+        self._dict_items = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def write(self, item: Union[tuple, dict]):
+        self._pending.append(item)
+        if len(self._pending) >= CSV_CHUNK_ROWS:
+            self._flush()
+
+    def close(self):
+        try:
+            if self._pending: self._flush()
+        finally:
+            if self._arrow_writer: self._arrow_writer.close()
+            if self._file: self._file.close()
+        if self.rows_written:
+            log.info(f"Data successfully saved to {self.final_filename} ({self.rows_written} rows)")
+        else:
+            log.warning("No data extracted, skipping CSV file writing.")
+
+    def _flush(self):
+        if self._csv_writer is None and self._arrow_writer is None:
+            self._open(self._pending)
+        rows = _to_rows(self._pending, self.fieldnames) if self._dict_items else self._pending
+        if self._arrow_writer:
+            import pyarrow as pa
+            # Stringify like csv.writer does (None stays empty), so non-str values such as floats don't fail
+            columns = [pa.array([None if value is None else str(value) for value in column], type=pa.string()) for column in zip(*rows)]
+            self._arrow_writer.write_table(pa.Table.from_arrays(columns, schema=self._arrow_schema))
+        else:
+            self._csv_writer.writerows(rows)
+        self.rows_written += len(self._pending)
+        self._pending = []
+
+    def _open(self, first_chunk):
+        # Check if fieldnames match the first data item (optional robustness)
+        first_item = first_chunk[0]
+        self._dict_items = isinstance(first_item, dict)
+        if self._dict_items:
+            if not all(key in first_item for key in self.fieldnames):
+                 log.warning(f"Mismatch between defined fieldnames {self.fieldnames} and keys in extracted data {list(first_item.keys())}. Writing may be incomplete.")
+        elif list(getattr(first_item, '_fields', self.fieldnames)) != list(self.fieldnames) or len(first_item) != len(self.fieldnames):
+             log.warning(f"Mismatch between defined fieldnames {self.fieldnames} and fields of extracted data {list(getattr(first_item, '_fields', range(len(first_item))))}. Columns may be wrong.")
+        self.final_filename = _timestamped_filename(self.output_file)
+        log.info(f"Preparing to save data to: {self.final_filename}")
+        _ensure_output_dir(self.final_filename)
+
+        pyarrow_csv = _load_pyarrow_csv() if self.use_pyarrow else None
+        if pyarrow_csv:
+            import pyarrow as pa
+            self._arrow_schema = pa.schema([(name, pa.string()) for name in self.fieldnames])
+            self._arrow_writer = pyarrow_csv.CSVWriter(self.final_filename, self._arrow_schema, write_options=pyarrow_csv.WriteOptions(quoting_style="needed"))
+        else:
+            self._file = open(self.final_filename, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE)
+            self._csv_writer = csv.writer(self._file)
+            self._csv_writer.writerow(self.fieldnames)
+
+def _to_rows(data, fieldnames):
+    """
+    Converts item dicts to value tuples in fieldnames order for csv.writer.
+    Extra keys are ignored and missing ones become empty cells (like DictWriter's
+    extrasaction='ignore'), without DictWriter's per-row validation overhead.
+    """
+    return [tuple(map(item.get, fieldnames)) for item in data]
+
+# --- Timestamped filename logic (Keep as is) ---
+def _timestamped_filename(output_file: str) -> str:
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    base_name, extension = os.path.splitext(output_file)
+    if not extension: extension = ".csv"
+    return f"{base_name}_{timestamp}{extension}"
+
+def _ensure_output_dir(final_filename: str):
+    output_dir = os.path.dirname(final_filename)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir); log.info(f"Created output directory: {output_dir}")
 
 
 # --- Main Orchestration Function (Keep as is) ---
-def run_scraper(target_url: str, output_file: str, headless: bool, wait_time: int):
+def run_scraper(target_url: str, output_file: str, headless: bool, wait_time: int,
+                ready_selector: str = DEFAULT_READY_SELECTOR, scroll: bool = False, force_selenium: bool = False,
+                lean: bool = False):
     """
     Orchestrates the scraping process: setup, navigate, extract, handle data.
     This function is called by cli.py.
+    Server-rendered pages are fetched over plain HTTP first (see `fetch_static`); the
+    browser is only used when the data needs JavaScript, when scrolling, or with force_selenium.
+    The WebDriver is borrowed from `driver_pool`, so calling this repeatedly in one
+    process reuses the same warm browser instead of launching a new one each time.
     # ... (rest of docstring) ...
     """
     log.info("Starting the scraping process via run_scraper...")
-    driver = None; success = False
+    success = False
     try:
-        driver = setup_driver(headless=headless)
-        page_html = navigate_to_url(driver, target_url, wait_time)
+        page_html = None
+        if not (force_selenium or scroll): # Scrolling needs a real browser
+            page_html = fetch_static(target_url, ready_selector=ready_selector)
+        if not page_html:
+            page_html = _fetch_with_browser(target_url, headless, wait_time, ready_selector, scroll=scroll, lean=lean)
         if page_html:
-            extracted_info = extract_data(page_html) # Calls the EXAMPLE extract_data
+            extracted_info = extract_data(page_html) # Calls the EXAMPLE extract_data (a generator, consumed by handle_data)
             handle_data(extracted_info, output_file) # Calls the EXAMPLE handle_data
             log.info("Scraping process completed successfully.")
             success = True
         else: log.error("Failed to retrieve page HTML."); success = False
     except Exception as e: log.error(f"Scraping process failed: {e}", exc_info=True); success = False
+    return success
+
+def _fetch_with_browser(target_url, headless, wait_time, ready_selector, scroll=False, lean=False):
+    with driver_pool.acquire(headless=headless, lean=lean) as driver:
+        return navigate_to_url(driver, target_url, wait_time, ready_selector=ready_selector, scroll=scroll)
+
+
+# --- Batch Orchestration Function (many URLs, concurrent HTTP) ---
+MAX_CONCURRENT_FETCHES = 16 # Pages downloaded/parsed at the same time
+MAX_HTTP_CONNECTIONS = 32
+
+def run_many(target_urls: list[str], output_file: str, headless: bool, wait_time: int,
+             ready_selector: str = DEFAULT_READY_SELECTOR, force_selenium: bool = False, lean: bool = False):
+    """
+    Scrapes many URLs into a single timestamped CSV file.
+    Pages are downloaded concurrently with httpx.AsyncClient (at most MAX_CONCURRENT_FETCHES
+    at a time) and parsed in worker threads while other downloads are in flight. Pages whose
+    static HTML lacks `ready_selector` fall back to the pooled WebDriver, one at a time.
+    This function is called by cli.py.
+
+    Returns:
+        True if every URL was scraped, False otherwise.
+    """
+    log.info(f"Starting the batch scraping process for {len(target_urls)} URL(s) via run_many...")
+    try:
+        failed_urls = asyncio.run(_run_many_async(target_urls, output_file, headless, wait_time, ready_selector, force_selenium, lean))
+    except Exception as e:
+        log.error(f"Batch scraping process failed: {e}", exc_info=True); return False
+    if failed_urls:
+        log.error(f"Batch finished with {len(failed_urls)} failed URL(s): {', '.join(failed_urls)}")
+        return False
+    log.info("Batch scraping process completed successfully.")
+    return True
+
+async def _run_many_async(target_urls, output_file, headless, wait_time, ready_selector, force_selenium, lean):
+    rows = asyncio.Queue()
+    writer_task = asyncio.create_task(_csv_writer_consumer(rows, output_file))
+    loop = asyncio.get_running_loop()
+
+    try:
+        # Malformed URLs (e.g. 'http://[::1') can't be fetched by either path, so they fail up front
+        failed_urls = [url for url in target_urls if not _is_valid_url(url)]
+        target_urls = [url for url in target_urls if url not in failed_urls]
+        needs_browser = list(target_urls)
+        if not ready_selector and not force_selenium:
+            log.info("No ready selector to check static HTML against, using Selenium for every URL.")
+        elif not force_selenium:
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+            limits = httpx.Limits(max_connections=MAX_HTTP_CONNECTIONS)
+            async with httpx.AsyncClient(http2=True, follow_redirects=True, limits=limits, timeout=HTTP_TIMEOUT, default_encoding=_sniff_html_encoding) as client:
+                handled = await asyncio.gather(*(_scrape_one(client, semaphore, url, rows, ready_selector) for url in target_urls))
+            needs_browser = [url for url, ok in zip(target_urls, handled) if not ok]
+
+        for url in needs_browser:
+            try:
+                page_html = await loop.run_in_executor(None, _fetch_with_browser, url, headless, wait_time, ready_selector, False, lean)
+                await rows.put(await loop.run_in_executor(None, _extract_all, page_html))
+            except Exception as e:
+                log.error(f"Scraping {url} with Selenium failed: {e}", exc_info=True); failed_urls.append(url)
     finally:
-        if driver: driver.quit(); log.info("WebDriver closed.")
-    return success
\ No newline at end of file
+        # Always let the writer drain and close the file, so rows already queued are never lost
+        await rows.put(None) # Tell the writer there is nothing more to come
+        await writer_task
+    return failed_urls
+
+def _is_valid_url(url):
+    try:
+        httpx.URL(url)
+        return True
+    except httpx.InvalidURL as e:
+        log.error(f"Skipping invalid URL {url!r}: {e}"); return False
+
+async def _scrape_one(client, semaphore, url, rows, ready_selector):
+    """
+    Fetches one URL over async HTTP and queues its items. Returns False if the page needs the browser.
+    Errors are handled per URL so one bad page never aborts the rest of the batch.
+    """
+    async with semaphore:
+        log.info(f"Fetching (async HTTP): {url}")
+        try:
+            response = await client.get(url)
+            response.raise_for_status()
+        except (httpx.HTTPError, httpx.InvalidURL) as e: # InvalidURL is not an HTTPError subclass
+            log.info(f"Async fetch of {url} failed ({e}), will retry with Selenium.")
+            return False
+        loop = asyncio.get_running_loop()
+        page_html = response.text
+        try:
+            if not await loop.run_in_executor(None, _has_ready_element, page_html, ready_selector):
+                log.info(f"'{ready_selector}' not found in static HTML of {url}, will retry with Selenium.")
+                return False
+            items = await loop.run_in_executor(None, _extract_all, page_html)
+        except Exception as e:
+            log.warning(f"Processing static HTML of {url} failed ({e}), will retry with Selenium.", exc_info=True)
+            return False
+        await rows.put(items)
+        return True
+
+async def _csv_writer_consumer(rows, output_file):
+    """Sole owner of the batch CSV file: writes each page's items as they arrive, until a None sentinel."""
+    with CSVSink(output_file, fieldnames=FIELDNAMES) as sink:
+        while True:
+            items = await rows.get()
+            if items is None: break
+            for item in items:
+                sink.write(item)
+    return sink.rows_written